@@ -1,5 +1,8 @@
+import array
 import math
 import cmath
+import random
+import sys
 
 # ============================ funcoes basicas de matriz ============================
 
@@ -24,18 +27,85 @@ def matriz_transposta(A):
     m, n = dimensoes_matriz(A)
     return [[A[i][j] for i in range(m)] for j in range(n)]
 
+def larguras_de_banda(A):
+    # devolve (inferior, superior): quantas diagonais abaixo e acima da principal tem entradas nao nulas
+    inferior = superior = 0
+    for i, linha in enumerate(A):
+        for j, x in enumerate(linha):
+            if x != 0:
+                if i - j > inferior:
+                    inferior = i - j
+                elif j - i > superior:
+                    superior = j - i
+    return inferior, superior
+
+def detectar_estrutura(A):
+    # identifica a estrutura de a para escolher algoritmos mais baratos; devolve (tipo, info) com tipo
+    # "identidade", "diagonal", "permutacao", "triangular_superior", "triangular_inferior", "banda" ou "densa"
+    # info eh a permutacao (coluna do 1 em cada linha) no caso "permutacao" e as larguras de banda nos outros
+    m, n = dimensoes_matriz(A)
+    bandas = larguras_de_banda(A)
+    if m != n or n == 0:
+        return "densa", bandas
+    inferior, superior = bandas
+    if inferior == 0 and superior == 0:
+        if all(A[i][i] == 1 for i in range(n)):
+            return "identidade", bandas
+        return "diagonal", bandas
+    # permutacao: cada linha tem um unico 1 e as colunas desses 1 sao todas diferentes
+    permutacao = []
+    for linha in A:
+        nao_nulos = [j for j, x in enumerate(linha) if x != 0]
+        if len(nao_nulos) != 1 or linha[nao_nulos[0]] != 1:
+            break
+        permutacao.append(nao_nulos[0])
+    if len(permutacao) == n and len(set(permutacao)) == n:
+        return "permutacao", permutacao
+    if inferior == 0:
+        return "triangular_superior", bandas
+    if superior == 0:
+        return "triangular_inferior", bandas
+    if inferior + superior + 1 <= n // 2:
+        return "banda", bandas
+    return "densa", bandas
+
 def multiplicar_matrizes(A, B):
     # faz o produto c = a * b (se as dimensoes forem compativeis)
+    # identidade, diagonal e permutacao custam o(n^2); triangulares e banda so percorrem as faixas nao nulas
     m, n = dimensoes_matriz(A)
     n2, p = dimensoes_matriz(B)
     assert n == n2, "dimensoes incompativeis em multiplicar_matrizes"
+    # nos atalhos, somar 0.0 deixa as entradas do mesmo tipo que o caso geral (float, ou complex)
+    tipo_a, info_a = detectar_estrutura(A)
+    tipo_b, info_b = detectar_estrutura(B)
+    if tipo_a == "identidade":
+        return [[0.0 + x for x in linha] for linha in B]
+    if tipo_b == "identidade":
+        return [[0.0 + x for x in linha] for linha in A]
+    if tipo_a == "diagonal":
+        return [[0.0 + A[i][i] * x for x in B[i]] for i in range(m)]
+    if tipo_b == "diagonal":
+        return [[0.0 + A[i][j] * B[j][j] for j in range(p)] for i in range(m)]
+    if tipo_a == "permutacao":
+        # linha i de a * b eh a linha de b onde a linha i de a tem o 1
+        return [[0.0 + x for x in B[info_a[i]]] for i in range(m)]
+    if tipo_b == "permutacao":
+        # a coluna k de a vai para a coluna onde a linha k de b tem o 1
+        C = [[0.0] * p for _ in range(m)]
+        for i in range(m):
+            for k in range(n):
+                C[i][info_b[k]] = 0.0 + A[i][k]
+        return C
+    # caso geral: so percorre as faixas dentro das larguras de banda de a e de b
+    inferior_a, superior_a = info_a
+    inferior_b, superior_b = info_b
     C = [[0.0 for _ in range(p)] for __ in range(m)]
     for i in range(m):
-        for k in range(n):
+        for k in range(max(0, i - inferior_a), min(n, i + superior_a + 1)):
             aik = A[i][k]
             if aik == 0:
                 continue
-            for j in range(p):
+            for j in range(max(0, k - inferior_b), min(p, k + superior_b + 1)):
                 C[i][j] += aik * B[k][j]
     return C
 
@@ -45,6 +115,14 @@ def multiplicar_matriz_vetor(A, v):
     assert len(v) == n, "dimensao do vetor nao compativel com a matriz"
     return [sum(A[i][j] * v[j] for j in range(n)) for i in range(m)]
 
+def produto_interno(u, v):
+    # calcula o produto interno <u, v> (conjuga u quando os vetores sao complexos)
+    return sum(x.conjugate() * y for x, y in zip(u, v))
+
+def norma_vetor(v):
+    # calcula a norma euclidiana do vetor v
+    return math.sqrt(sum(abs(x) ** 2 for x in v))
+
 def multiplicar_linha_por_escalar(M, i, escalar):
     # multiplica a linha i da matriz m por um escalar
     M[i] = [x * escalar for x in M[i]]
@@ -62,7 +140,7 @@ def aumentar_matriz(A, B):
     m1, n1 = dimensoes_matriz(A)
     m2, n2 = dimensoes_matriz(B)
     assert m1 == m2, "matrizes devem ter o mesmo numero de linhas em aumentar_matriz"
-    return [A[i] + B[i] for i in range(m1)]
+    return [list(A[i]) + list(B[i]) for i in range(m1)]
 
 def forma_escalonada_reduzida(M, eps=1e-10):
     # calcula a forma escalonada reduzida de m usando eliminacao de gauss jordan
@@ -110,6 +188,22 @@ def inversa_matriz_quadrada(A, eps=1e-10):
     # calcula a inversa de uma matriz quadrada a usando gauss jordan
     n, n2 = dimensoes_matriz(A)
     assert n == n2, "matriz deve ser quadrada em inversa_matriz_quadrada"
+    # passo 0: matrizes com estrutura conhecida nao precisam de gauss jordan
+    tipo, info = detectar_estrutura(A)
+    if tipo == "identidade":
+        return matriz_identidade(n)
+    if tipo == "diagonal":
+        if any(abs(A[i][i]) <= eps for i in range(n)):
+            raise ValueError("matriz singular, sem inversa")
+        return [[1.0 / A[i][i] if i == j else 0.0 for j in range(n)] for i in range(n)]
+    if tipo == "permutacao":
+        # a inversa de uma permutacao eh a sua transposta
+        inversa = [[0.0] * n for _ in range(n)]
+        for i in range(n):
+            inversa[info[i]][i] = 1.0
+        return inversa
+    if tipo in ("triangular_superior", "triangular_inferior"):
+        return inversa_triangular(A, tipo == "triangular_superior", eps)
     # passo 1: montar a matriz aumentada [a | i]
     AI = aumentar_matriz(copiar_matriz(A), matriz_identidade(n))
     i = 0
@@ -134,6 +228,100 @@ def inversa_matriz_quadrada(A, eps=1e-10):
     inversa = [linha[n:] for linha in AI]
     return inversa
 
+def inversa_triangular(A, superior=True, eps=1e-10):
+    # inverte uma matriz triangular por substituicao coluna a coluna (a inversa tem a mesma forma)
+    n = len(A)
+    if not superior:
+        return matriz_transposta(inversa_triangular(matriz_transposta(A), True, eps))
+    if any(abs(A[i][i]) <= eps for i in range(n)):
+        raise ValueError("matriz singular, sem inversa")
+    X = [[0.0] * n for _ in range(n)]
+    for j in range(n):
+        X[j][j] = 1.0 / A[j][j]
+        for i in range(j - 1, -1, -1):
+            X[i][j] = -sum(A[i][k] * X[k][j] for k in range(i + 1, j + 1)) / A[i][i]
+    return X
+
+def decomposicao_lu(A, eps=1e-10):
+    # fatora p a = l u com pivoteamento parcial, guardando l (sem a diagonal) e u na mesma matriz
+    # para matrizes em banda so a faixa que pode ficar nao nula eh percorrida
+    n, n2 = dimensoes_matriz(A)
+    assert n == n2, "matriz deve ser quadrada em decomposicao_lu"
+    LU = copiar_matriz(A)
+    pivos = list(range(n))
+    # com pivoteamento, l fica com a banda inferior de a e u com a soma das duas bandas
+    inferior, superior = larguras_de_banda(A)
+    superior += inferior
+    for j in range(n):
+        fim_linhas = min(n, j + inferior + 1)
+        fim_colunas = min(n, j + superior + 1)
+        # passo 1: escolher a linha com o maior valor absoluto na coluna j
+        indice_pivo = max(range(j, fim_linhas), key=lambda k: abs(LU[k][j]))
+        if abs(LU[indice_pivo][j]) <= eps:
+            raise ValueError("matriz singular, sem decomposicao lu")
+        trocar_linhas(LU, j, indice_pivo)
+        pivos[j], pivos[indice_pivo] = pivos[indice_pivo], pivos[j]
+        # passo 2: guardar os multiplicadores abaixo do pivo e atualizar o resto das linhas
+        valor_pivo = LU[j][j]
+        for k in range(j + 1, fim_linhas):
+            fator = LU[k][j] / valor_pivo
+            LU[k][j] = fator
+            if fator == 0:
+                continue
+            for t in range(j + 1, fim_colunas):
+                LU[k][t] -= fator * LU[j][t]
+    return LU, pivos
+
+def resolver_com_lu(LU, pivos, b):
+    # resolve a x = b reaproveitando a fatoracao devolvida por decomposicao_lu
+    n = len(LU)
+    # passo 1: aplicar a permutacao e resolver l y = p b (substituicao para frente)
+    x = [b[p] for p in pivos]
+    for i in range(n):
+        linha = LU[i]
+        x[i] -= sum(linha[j] * x[j] for j in range(i))
+    # passo 2: resolver u x = y (substituicao para tras)
+    for i in range(n - 1, -1, -1):
+        linha = LU[i]
+        x[i] = (x[i] - sum(linha[j] * x[j] for j in range(i + 1, n))) / linha[i]
+    return x
+
+def sinal_permutacao(permutacao):
+    # devolve +1 ou -1 conforme a paridade da permutacao (pelo numero de ciclos)
+    n = len(permutacao)
+    visitados = [False] * n
+    ciclos = 0
+    for i in range(n):
+        if not visitados[i]:
+            ciclos += 1
+            j = i
+            while not visitados[j]:
+                visitados[j] = True
+                j = permutacao[j]
+    return 1 if (n - ciclos) % 2 == 0 else -1
+
+def determinante_matriz(A):
+    # calcula o determinante: direto pela estrutura quando possivel, senao pela decomposicao lu
+    n, n2 = dimensoes_matriz(A)
+    assert n == n2, "matriz deve ser quadrada em determinante_matriz"
+    tipo, info = detectar_estrutura(A)
+    if tipo == "permutacao":
+        return float(sinal_permutacao(info))
+    if tipo in ("identidade", "diagonal", "triangular_superior", "triangular_inferior"):
+        diagonal = [A[i][i] for i in range(n)]
+        sinal = 1
+    else:
+        try:
+            LU, pivos = decomposicao_lu(A, eps=0.0)
+        except ValueError:
+            return 0.0
+        diagonal = [LU[i][i] for i in range(n)]
+        sinal = sinal_permutacao(pivos)
+    produto = float(sinal)
+    for d in diagonal:
+        produto *= d
+    return produto
+
 def matriz_menos_lambda_vezes_identidade(A, lam):
     # calcula a matriz a - lam * i
     n, m = dimensoes_matriz(A)
@@ -624,6 +812,30 @@ def autovalores_3x3_por_qr(A, iters=60):
     # no final, os autovalores aproximados aparecem na diagonal de ak
     return [Ak[0][0], Ak[1][1], Ak[2][2]]
 
+def autovalores_por_estrutura(A):
+    # devolve os autovalores lidos direto da estrutura da matriz, sem iteracao:
+    # a diagonal para matrizes triangulares e raizes da unidade (uma por ciclo) para permutacoes
+    # devolve None quando a matriz nao tem estrutura aproveitavel
+    n, _ = dimensoes_matriz(A)
+    tipo, info = detectar_estrutura(A)
+    if tipo in ("identidade", "diagonal", "triangular_superior", "triangular_inferior"):
+        return [A[i][i] for i in range(n)]
+    if tipo == "permutacao":
+        autovalores = []
+        visitados = [False] * n
+        for i in range(n):
+            # cada ciclo de comprimento l contribui com as l raizes l-esimas da unidade
+            comprimento = 0
+            j = i
+            while not visitados[j]:
+                visitados[j] = True
+                j = info[j]
+                comprimento += 1
+            for t in range(comprimento):
+                autovalores.append(simplificar_complexo(cmath.exp(2j * math.pi * t / comprimento)))
+        return autovalores
+    return None
+
 def autovetores_para_autovalor(A, lam, eps=1e-8):
     # calcula autovetores associados a lam resolvendo (a - lam i) x = 0
     B = matriz_menos_lambda_vezes_identidade(A, lam)
@@ -669,17 +881,19 @@ def executar_tarefa_4():
         print("   ", [float(x) for x in linha])
     print("-"*70)
 
-    # passo 2: calcular autovalores de acordo com o tamanho
-    if n == 2:
+    # passo 2: calcular autovalores pela estrutura da matriz ou de acordo com o tamanho
+    autovalores = autovalores_por_estrutura(A)
+    if autovalores is not None:
+        explicacao = "(Lidos direto da estrutura da matriz: diagonal, triangular ou permutacao)"
+    elif n == 2:
         autovalores = autovalores_2x2(A)
+        explicacao = "(Calculados pela formula do traco e determinante)"
     else:
         autovalores = autovalores_3x3_por_qr(A)
+        explicacao = "(Aproximados pelo algoritmo QR iterativo)"
 
     print("\nAUTOVALORES ENCONTRADOS:")
-    if n == 2:
-        print("   (Calculados pela formula do traco e determinante)")
-    else:
-        print("   (Aproximados pelo algoritmo QR iterativo)")
+    print("   " + explicacao)
     print()
     for i, lam in enumerate(autovalores, 1):
         print(f"   lambda_{i} = {lam}")
@@ -715,6 +929,700 @@ def executar_tarefa_4():
     
     print("-"*70)
 
+# ============================ autovalores de operadores grandes (krylov) ============================
+
+def operador_de_matriz(A):
+    # devolve o produto matriz-vetor de a como funcao, que eh tudo que os metodos de krylov usam
+    return lambda v: multiplicar_matriz_vetor(A, v)
+
+def operador_esparso(linhas):
+    # devolve o produto matriz-vetor de uma matriz esparsa guardada como lista de dicionarios
+    # (linhas[i] = {j: a_ij} apenas com as entradas nao nulas), sem nunca montar a matriz densa
+    return lambda v: [sum(a * v[j] for j, a in linha.items()) for linha in linhas]
+
+def autopares_simetrica_jacobi(S, tol=1e-12, max_varreduras=100):
+    # calcula todos os autovalores e autovetores de uma matriz simetrica real pelo metodo de jacobi
+    # devolve (autovalores, autovetores), com cada autovetor como uma lista
+    A = copiar_matriz(S)
+    n = len(A)
+    V = matriz_identidade(n)
+    norma = math.sqrt(sum(x * x for linha in A for x in linha))
+    for _ in range(max_varreduras):
+        # passo 1: parar quando a parte fora da diagonal ficar desprezivel
+        fora_diagonal = sum(A[i][j] * A[i][j] for i in range(n) for j in range(i + 1, n))
+        if math.sqrt(fora_diagonal) <= tol * norma:
+            break
+        # passo 2: uma varredura de rotacoes, cada uma zerando a[p][q]
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                apq = A[p][q]
+                if apq == 0:
+                    continue
+                theta = (A[q][q] - A[p][p]) / (2 * apq)
+                t = (1.0 if theta >= 0 else -1.0) / (abs(theta) + math.sqrt(theta * theta + 1))
+                c = 1 / math.sqrt(t * t + 1)
+                s = t * c
+                for k in range(n):
+                    akp, akq = A[k][p], A[k][q]
+                    A[k][p] = c * akp - s * akq
+                    A[k][q] = s * akp + c * akq
+                for k in range(n):
+                    apk, aqk = A[p][k], A[q][k]
+                    A[p][k] = c * apk - s * aqk
+                    A[q][k] = s * apk + c * aqk
+                for k in range(n):
+                    vkp, vkq = V[k][p], V[k][q]
+                    V[k][p] = c * vkp - s * vkq
+                    V[k][q] = s * vkp + c * vkq
+    autovalores = [A[i][i] for i in range(n)]
+    autovetores = [[V[k][i] for k in range(n)] for i in range(n)]
+    return autovalores, autovetores
+
+def rotacao_givens(a, b):
+    # devolve (c, s) tais que [[c, s], [-conj(s), c]] * [a, b] = [r, 0] (funciona com complexos)
+    if b == 0:
+        return 1.0, 0.0
+    if a == 0:
+        return 0.0, 1.0
+    r = math.sqrt(abs(a) ** 2 + abs(b) ** 2)
+    return abs(a) / r, (a / abs(a)) * b.conjugate() / r
+
+def passo_qr_deslocado(H, mu, Q=None):
+    # aplica na matriz de hessenberg h (no lugar) um passo qr com deslocamento mu:
+    # h - mu i = q r e depois h <- r q + mu i; se q for dada, acumula q <- q * q_passo
+    m = len(H)
+    for i in range(m):
+        H[i][i] -= mu
+    # passo 1: zerar a subdiagonal com rotacoes pela esquerda (h vira r)
+    rotacoes = []
+    for i in range(m - 1):
+        c, s = rotacao_givens(H[i][i], H[i + 1][i])
+        for j in range(i, m):
+            x, y = H[i][j], H[i + 1][j]
+            H[i][j] = c * x + s * y
+            H[i + 1][j] = -s.conjugate() * x + c * y
+        rotacoes.append((c, s))
+    # passo 2: aplicar as mesmas rotacoes pela direita (r q) e acumular em q
+    for i, (c, s) in enumerate(rotacoes):
+        for k in range(min(i + 2, m)):
+            x, y = H[k][i], H[k][i + 1]
+            H[k][i] = c * x + s.conjugate() * y
+            H[k][i + 1] = -s * x + c * y
+        if Q is not None:
+            for k in range(len(Q)):
+                x, y = Q[k][i], Q[k][i + 1]
+                Q[k][i] = c * x + s.conjugate() * y
+                Q[k][i + 1] = -s * x + c * y
+    for i in range(m):
+        H[i][i] += mu
+
+def autovalores_hessenberg_qr(H, tol=1e-13, max_iters=1000):
+    # calcula todos os autovalores (possivelmente complexos) de uma matriz de hessenberg
+    # com o algoritmo qr usando deslocamento de wilkinson e deflacao pelo canto inferior
+    A = [[complex(x) for x in linha] for linha in H]
+    n = len(A)
+    escala = max((abs(x) for linha in A for x in linha), default=0.0)
+    autovalores = []
+    iters = 0
+    while n > 1:
+        # passo 1: se a ultima subdiagonal zerou, o canto inferior ja eh um autovalor
+        limite = tol * (abs(A[n - 1][n - 1]) + abs(A[n - 2][n - 2]))
+        if abs(A[n - 1][n - 2]) <= (limite if limite > 0 else tol * escala):
+            autovalores.append(A[n - 1][n - 1])
+            A = [linha[:n - 1] for linha in A[:n - 1]]
+            n -= 1
+            iters = 0
+            continue
+        if iters >= max_iters:
+            raise ValueError("algoritmo qr nao convergiu em autovalores_hessenberg_qr")
+        # passo 2: deslocamento de wilkinson (autovalor do bloco 2x2 inferior mais proximo do canto)
+        l1, l2 = autovalores_2x2([A[n - 2][n - 2:n], A[n - 1][n - 2:n]])
+        canto = A[n - 1][n - 1]
+        mu = l1 if abs(l1 - canto) <= abs(l2 - canto) else l2
+        if iters > 0 and iters % 10 == 0:
+            # deslocamento excepcional para sair de ciclos
+            mu += abs(A[n - 1][n - 2])
+        passo_qr_deslocado(A, mu)
+        iters += 1
+    if n == 1:
+        autovalores.append(A[0][0])
+    return autovalores
+
+def autovetor_por_iteracao_inversa(A, lam, iters=3, y0=None):
+    # aproxima um autovetor unitario de a para o autovalor lam resolvendo (a - lam i) y = x algumas vezes
+    # (y0 eh o vetor inicial; para matrizes de hessenberg a lu em banda custa so o(n^2))
+    n = len(A)
+    perturbacao = 1e-10 * max(abs(lam), 1.0)
+    while True:
+        try:
+            LU, pivos = decomposicao_lu(matriz_menos_lambda_vezes_identidade(A, lam + perturbacao), eps=0.0)
+            break
+        except ValueError:
+            # se o deslocamento caiu exatamente num autovalor, afasta um pouco mais
+            perturbacao *= 1e3
+    y = [1.0 + i / n for i in range(n)] if y0 is None else y0
+    for _ in range(iters):
+        y = resolver_com_lu(LU, pivos, y)
+        norma = norma_vetor(y)
+        y = [x / norma for x in y]
+    return y
+
+def ortogonalizar_contra_base(w, V):
+    # remove de w as componentes nos vetores ortonormais de v (gram schmidt modificado aplicado duas vezes)
+    # devolve o vetor ortogonalizado e os coeficientes removidos
+    coeficientes = [0.0] * len(V)
+    for _ in range(2):
+        for i, vi in enumerate(V):
+            c = produto_interno(vi, w)
+            if c != 0:
+                coeficientes[i] += c
+                w = [x - c * y for x, y in zip(w, vi)]
+    return w, coeficientes
+
+def estender_fatoracao_krylov(aplicar_A, V, H, f, m, simetrico=False):
+    # estende a fatoracao a v = v h + f e^t de len(v) ate m vetores (no lugar em v e h)
+    # e devolve o novo residuo f; no caso simetrico (lanczos) so a tridiagonal de h eh guardada
+    n = len(f)
+    escala = max((abs(x) for linha in H for x in linha), default=0.0)
+    for j in range(len(V), m):
+        beta = norma_vetor(f)
+        if j > 0 and beta <= 1e-13 * escala:
+            # passo 1a: quebra (o subespaco ficou invariante), continua com um vetor aleatorio ortogonal
+            gerador = random.Random(j)
+            f, _ = ortogonalizar_contra_base([gerador.uniform(-1.0, 1.0) for _ in range(n)], V)
+            norma = norma_vetor(f)
+            v = [x / norma for x in f]
+            beta = 0.0
+        else:
+            # passo 1b: o proximo vetor da base eh o residuo normalizado
+            v = [x / beta for x in f]
+        if j > 0:
+            H[j][j - 1] = beta
+            if simetrico:
+                H[j - 1][j] = beta
+        V.append(v)
+        # passo 2: aplicar o operador e ortogonalizar contra toda a base
+        f, h = ortogonalizar_contra_base(aplicar_A(v), V)
+        if simetrico:
+            H[j][j] = h[j].real
+        else:
+            for i in range(j + 1):
+                H[i][j] = h[i]
+        escala = max(escala, beta, max(abs(x) for x in h))
+    return f
+
+def reiniciar_krylov(H, V, f, deslocamentos, k, simetrico=False):
+    # reinicio implicito: aplica passos qr com os deslocamentos (valores de ritz indesejados)
+    # e comprime a fatoracao de m para k vetores sem nenhum produto extra com o operador
+    m = len(H)
+    H = copiar_matriz(H)
+    Q = matriz_identidade(m)
+    for mu in deslocamentos:
+        passo_qr_deslocado(H, mu, Q)
+    # passo 1: nova base v <- v q (so as k + 1 primeiras colunas sao usadas)
+    novos = []
+    for j in range(k + 1):
+        coluna = [0.0] * len(f)
+        for i in range(m):
+            if Q[i][j] != 0:
+                coluna = [x + Q[i][j] * y for x, y in zip(coluna, V[i])]
+        novos.append(coluna)
+    # passo 2: novo residuo f <- v_{k+1} h[k][k-1] + f q[m-1][k-1]
+    beta, sigma = H[k][k - 1], Q[m - 1][k - 1]
+    f = [beta * x + sigma * y for x, y in zip(novos[k], f)]
+    # passo 3: truncar h para o bloco k x k (no caso simetrico mantem so a tridiagonal simetrizada)
+    H_novo = [[0.0] * m for _ in range(m)]
+    for i in range(k):
+        for j in range(k):
+            if not simetrico:
+                H_novo[i][j] = H[i][j]
+            elif i == j:
+                H_novo[i][j] = H[i][i].real
+            elif abs(i - j) == 1:
+                H_novo[i][j] = (H[i][j].real + H[j][i].real) / 2
+    return H_novo, novos[:k], f
+
+def simplificar_complexo(x, tol=1e-10):
+    # devolve a parte real quando a parte imaginaria for desprezivel
+    if isinstance(x, complex) and abs(x.imag) <= tol * max(abs(x), 1.0):
+        return x.real
+    return x
+
+def autopares_krylov(aplicar_A, n, k, simetrico=False, criterio="maiores", sigma=0.0,
+                     m=None, tol=1e-10, max_reinicios=300, v0=None, aplicar_inversa_deslocada=None):
+    # nucleo comum de lanczos (simetrico) e arnoldi (geral) com reinicio implicito
+    # criterio: "maiores" / "menores" (pela parte real), "maior_modulo" ou "proximos" (de sigma)
+    # devolve (autovalores, autovetores) na ordem do criterio
+    # autovalores interiores nao convergem direto, entao "proximos" usa aplicar_inversa_deslocada
+    # (x -> (a - sigma i)^-1 x, convertendo theta em sigma + 1/theta) quando dada; sem ela, so o caso
+    # simetrico eh aceito, pelo espectro dobrado (a - sigma i)^2, que usa apenas produtos matriz-vetor
+    assert 1 <= k < n, "k deve estar entre 1 e n - 1 em autopares_krylov"
+    assert criterio in ("maiores", "menores", "maior_modulo", "proximos"), "criterio invalido em autopares_krylov"
+    if criterio == "proximos" and aplicar_inversa_deslocada is None:
+        assert simetrico, "criterio 'proximos' no caso geral exige aplicar_inversa_deslocada"
+        return autopares_espectro_dobrado(aplicar_A, n, k, sigma, m, tol, max_reinicios, v0)
+    if m is None:
+        m = min(n, max(2 * k + 1, 20))
+    assert k < m <= n, "tamanho m do subespaco deve satisfazer k < m <= n"
+    deslocado_invertido = criterio == "proximos" and aplicar_inversa_deslocada is not None
+    if deslocado_invertido:
+        aplicar_A = aplicar_inversa_deslocada
+        chave = lambda lam: -abs(lam)
+    elif criterio == "maior_modulo":
+        chave = lambda lam: -abs(lam)
+    elif criterio == "maiores":
+        chave = lambda lam: -lam.real
+    else:
+        chave = lambda lam: lam.real
+    if v0 is None:
+        gerador = random.Random(0)
+        v0 = [gerador.uniform(-1.0, 1.0) for _ in range(n)]
+    assert len(v0) == n and norma_vetor(v0) > 0, "vetor inicial invalido em autopares_krylov"
+
+    V = []
+    H = [[0.0] * m for _ in range(m)]
+    f = list(v0)
+    for _ in range(max_reinicios):
+        # passo 1: completar a fatoracao ate m vetores (so aqui o operador eh aplicado)
+        f = estender_fatoracao_krylov(aplicar_A, V, H, f, m, simetrico)
+        norma_f = norma_vetor(f)
+
+        # passo 2: valores de ritz (autovalores de h) ordenados pelo criterio
+        if simetrico:
+            valores, vetores_h = autopares_simetrica_jacobi(H)
+        else:
+            valores, vetores_h = autovalores_hessenberg_qr(H), None
+        ordem = sorted(range(m), key=lambda i: chave(valores[i]))
+        desejados = ordem[:k]
+
+        # passo 3: o residuo de cada par de ritz eh ||f|| * |ultima componente de y|
+        convergiu = True
+        ys = []
+        for i in desejados:
+            y = vetores_h[i] if simetrico else autovetor_por_iteracao_inversa(H, valores[i])
+            ys.append(y)
+            if norma_f * abs(y[m - 1]) > tol * max(abs(valores[i]), tol):
+                convergiu = False
+                break
+        if convergiu:
+            autovalores, autovetores = [], []
+            for i, y in zip(desejados, ys):
+                x = [0.0] * n
+                for j in range(m):
+                    x = [a + y[j] * b for a, b in zip(x, V[j])]
+                # normaliza a fase para que autovetores reais saiam como floats
+                maior = max(x, key=abs)
+                fase = maior / abs(maior)
+                norma = norma_vetor(x)
+                lam = sigma + 1 / valores[i] if deslocado_invertido else valores[i]
+                autovalores.append(simplificar_complexo(lam))
+                autovetores.append([simplificar_complexo(a / (fase * norma)) for a in x])
+            return autovalores, autovetores
+
+        # passo 4: reinicio implicito usando os valores de ritz indesejados como deslocamentos
+        H, V, f = reiniciar_krylov(H, V, f, [valores[i] for i in ordem[k:]], k, simetrico)
+    raise ValueError("metodo de krylov nao convergiu, aumente m ou max_reinicios")
+
+def autopares_espectro_dobrado(aplicar_A, n, k, sigma, m=None, tol=1e-10, max_reinicios=300, v0=None):
+    # k autopares de um operador simetrico mais proximos de sigma usando so produtos matriz-vetor:
+    # os menores autovalores de (a - sigma i)^2 sao extremos e correspondem aos de a mais proximos de sigma
+    def aplicar_dobrado(v):
+        w = [a - sigma * x for a, x in zip(aplicar_A(v), v)]
+        return [a - sigma * x for a, x in zip(aplicar_A(w), w)]
+    # passo 1: pede alguns vetores a mais, para que um par sigma +- d cortado na fronteira venha inteiro
+    k_extra = min(k + 2, n - 1) if m is None else min(k + 2, n - 1, m - 1)
+    _, X = autopares_krylov(aplicar_dobrado, n, k_extra, True, "menores", m=m, tol=tol,
+                            max_reinicios=max_reinicios, v0=v0)
+    # passo 2: rayleigh-ritz com o operador original no subespaco encontrado
+    # (separa sigma + d de sigma - d, que o espectro dobrado nao distingue)
+    AX = [aplicar_A(x) for x in X]
+    T = [[(produto_interno(X[i], AX[j]) + produto_interno(X[j], AX[i])) / 2 for j in range(k_extra)]
+         for i in range(k_extra)]
+    valores, Y = autopares_simetrica_jacobi(T)
+    escala = max(max(abs(v) for v in valores), abs(sigma)) or 1.0
+    # passo 3: fica com os k mais proximos de sigma cujo residuo verdadeiro ||a x - lambda x|| eh pequeno
+    # (vetores que misturam autovalores diferentes com o mesmo valor dobrado sao descartados)
+    autovalores, autovetores = [], []
+    for i in sorted(range(k_extra), key=lambda i: abs(valores[i] - sigma)):
+        x = [0.0] * n
+        Ax = [0.0] * n
+        for t in range(k_extra):
+            x = [a + Y[i][t] * b for a, b in zip(x, X[t])]
+            Ax = [a + Y[i][t] * b for a, b in zip(Ax, AX[t])]
+        if norma_vetor([a - valores[i] * b for a, b in zip(Ax, x)]) <= tol * escala:
+            autovalores.append(valores[i])
+            autovetores.append(x)
+            if len(autovalores) == k:
+                return autovalores, autovetores
+    raise ValueError("espectro dobrado nao separou os autopares mais proximos de sigma, aumente m")
+
+def operador_deslocado_invertido(A, sigma):
+    # devolve x -> (a - sigma i)^-1 x para matrizes densas, fatorando a - sigma i uma unica vez
+    LU, pivos = decomposicao_lu(matriz_menos_lambda_vezes_identidade(A, sigma), eps=0.0)
+    return lambda v: resolver_com_lu(LU, pivos, v)
+
+def autopares_lanczos(aplicar_A, n, k, criterio="maiores", sigma=0.0, m=None, tol=1e-10,
+                      max_reinicios=300, aplicar_inversa_deslocada=None):
+    # k autopares de um operador simetrico n x n dado apenas pelo produto matriz-vetor aplicar_A
+    # (lanczos com reinicio implicito); a matriz densa nunca eh montada
+    return autopares_krylov(aplicar_A, n, k, True, criterio, sigma, m, tol, max_reinicios,
+                            aplicar_inversa_deslocada=aplicar_inversa_deslocada)
+
+def autopares_arnoldi(aplicar_A, n, k, criterio="maiores", sigma=0.0, m=None, tol=1e-10,
+                      max_reinicios=300, aplicar_inversa_deslocada=None):
+    # k autopares de um operador geral n x n dado apenas pelo produto matriz-vetor aplicar_A
+    # (arnoldi com reinicio implicito); autovalores complexos aparecem como complex
+    return autopares_krylov(aplicar_A, n, k, False, criterio, sigma, m, tol, max_reinicios,
+                            aplicar_inversa_deslocada=aplicar_inversa_deslocada)
+
+# ============================ decomposicao em valores singulares (svd) ============================
+
+def jacobi_unilateral(A, tol=1e-15, max_varreduras=60):
+    # metodo de jacobi unilateral (hestenes): gira pares de colunas de a ate ficarem ortogonais
+    # devolve (w, v) com a v = w, w e v como listas de colunas e v ortogonal n x n
+    m, n = dimensoes_matriz(A)
+    W = [[A[i][j] for i in range(m)] for j in range(n)]
+    V = [[1.0 if i == j else 0.0 for i in range(n)] for j in range(n)]
+    for _ in range(max_varreduras):
+        girou = False
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                # passo 1: produtos internos do par de colunas (matriz de gram 2x2)
+                alfa = produto_interno(W[p], W[p])
+                beta = produto_interno(W[q], W[q])
+                gama = produto_interno(W[p], W[q])
+                if abs(gama) <= tol * math.sqrt(alfa * beta):
+                    continue
+                girou = True
+                # passo 2: rotacao que diagonaliza a matriz de gram (mesma formula de autopares_simetrica_jacobi)
+                zeta = (beta - alfa) / (2 * gama)
+                t = (1.0 if zeta >= 0 else -1.0) / (abs(zeta) + math.sqrt(1 + zeta * zeta))
+                c = 1 / math.sqrt(1 + t * t)
+                s = c * t
+                for M in (W, V):
+                    cp, cq = M[p], M[q]
+                    M[p] = [c * x - s * y for x, y in zip(cp, cq)]
+                    M[q] = [s * x + c * y for x, y in zip(cp, cq)]
+        if not girou:
+            break
+    return W, V
+
+def completar_base_ortonormal(vetores, n, quantidade=None):
+    # completa uma lista de vetores ortonormais de r^n ate ter quantidade vetores (padrao n)
+    # cada vetor novo eh um vetor aleatorio ortogonalizado contra a base, custo o(n * len(base))
+    if quantidade is None:
+        quantidade = n
+    base = [v[:] for v in vetores]
+    gerador = random.Random(len(base))
+    while len(base) < quantidade:
+        w, _ = ortogonalizar_contra_base([gerador.uniform(-1.0, 1.0) for _ in range(n)], base)
+        norma = norma_vetor(w)
+        # um vetor aleatorio quase dentro do espaco gerado eh descartado e sorteado de novo
+        if norma > 1e-8:
+            base.append([x / norma for x in w])
+    return base
+
+def decomposicao_svd(A, k=None):
+    # calcula a svd economica a = u diag(s) vt com r = min(m, n) valores singulares em ordem decrescente
+    # (u eh m x r, s uma lista e vt eh r x n); com k, devolve so os k maiores (svd truncada)
+    # obs: o jacobi sempre roda ate o fim, a truncagem so reduz o tamanho da saida, nao o custo
+    m, n = dimensoes_matriz(A)
+    if m < n:
+        # para matrizes largas eh mais barato girar as colunas de a^t
+        U, S, Vt = decomposicao_svd(matriz_transposta(A), k)
+        return matriz_transposta(Vt), S, matriz_transposta(U)
+    W, V = jacobi_unilateral(A)
+    # passo 1: valores singulares sao as normas das colunas giradas
+    normas = [norma_vetor(w) for w in W]
+    ordem = sorted(range(n), key=lambda j: -normas[j])
+    if k is not None:
+        assert 1 <= k <= n, "k deve estar entre 1 e min(m, n) em decomposicao_svd"
+        ordem = ordem[:k]
+    S = [normas[j] for j in ordem]
+    # passo 2: colunas de u normalizadas; as de valor singular nulo sao completadas ortonormalmente
+    tol = tolerancia_posto(S, m, n)
+    colunas_u = [[x / normas[j] for x in W[j]] for j in ordem if normas[j] > tol]
+    if len(colunas_u) < len(ordem):
+        colunas_u = completar_base_ortonormal(colunas_u, m, len(ordem))
+    U = [[colunas_u[j][i] for j in range(len(ordem))] for i in range(m)]
+    Vt = [V[j][:] for j in ordem]
+    return U, S, Vt
+
+def tolerancia_posto(valores_singulares, m, n):
+    # tolerancia padrao para o posto numerico: max(m, n) * eps da maquina * maior valor singular
+    maior = max(valores_singulares, default=0.0)
+    return max(m, n) * sys.float_info.epsilon * maior
+
+def posto_numerico(A, tol=None):
+    # conta os valores singulares acima da tolerancia (posto numerico, sem depender de pivos)
+    m, n = dimensoes_matriz(A)
+    _, S, _ = decomposicao_svd(A)
+    if tol is None:
+        tol = tolerancia_posto(S, m, n)
+    return sum(1 for s in S if s > tol)
+
+def base_nucleo_ortonormal(A, tol=None):
+    # base ortonormal do nucleo de a: vetores singulares a direita com valor singular desprezivel
+    # (usa a matriz v completa do jacobi, entao funciona tambem quando m < n)
+    m, n = dimensoes_matriz(A)
+    W, V = jacobi_unilateral(A)
+    normas = [norma_vetor(w) for w in W]
+    if tol is None:
+        tol = tolerancia_posto(normas, m, n)
+    return [V[j][:] for j in range(n) if normas[j] <= tol]
+
+def base_imagem_ortonormal(A, tol=None):
+    # base ortonormal do espaco coluna de a: vetores singulares a esquerda com valor singular nao desprezivel
+    m, n = dimensoes_matriz(A)
+    U, S, _ = decomposicao_svd(A)
+    if tol is None:
+        tol = tolerancia_posto(S, m, n)
+    return [[U[i][j] for i in range(m)] for j in range(len(S)) if S[j] > tol]
+
+def pseudo_inversa(A, tol=None):
+    # calcula a pseudo-inversa de moore-penrose a+ = v diag(1/s) u^t, ignorando valores singulares desprezaveis
+    m, n = dimensoes_matriz(A)
+    U, S, Vt = decomposicao_svd(A)
+    if tol is None:
+        tol = tolerancia_posto(S, m, n)
+    P = [[0.0] * m for _ in range(n)]
+    for j, s in enumerate(S):
+        if s <= tol:
+            continue
+        for i in range(n):
+            fator = Vt[j][i] / s
+            if fator == 0:
+                continue
+            for t in range(m):
+                P[i][t] += fator * U[t][j]
+    return P
+
+def minimos_quadrados(A, b, tol=None):
+    # resolve min ||a x - b|| pela svd; se houver varias solucoes, devolve a de menor norma
+    m, n = dimensoes_matriz(A)
+    assert len(b) == m, "dimensao do vetor nao compativel com a matriz em minimos_quadrados"
+    U, S, Vt = decomposicao_svd(A)
+    if tol is None:
+        tol = tolerancia_posto(S, m, n)
+    x = [0.0] * n
+    for j, s in enumerate(S):
+        if s <= tol:
+            continue
+        coeficiente = sum(U[i][j] * b[i] for i in range(m)) / s
+        x = [a + coeficiente * v for a, v in zip(x, Vt[j])]
+    return x
+
+# ============================ precisao mista (float32 + refinamento iterativo) ============================
+
+def cabe_em_float32(A):
+    # verifica se todas as entradas cabem na faixa do float32 (senao virariam inf ao serem gravadas)
+    maior_float32 = 3.4028234663852886e38
+    return all(abs(x) <= maior_float32 for linha in A for x in linha)
+
+def matriz_float32(A):
+    # guarda a matriz em formato compacto: cada linha vira um array de float32 (4 bytes por entrada)
+    # as linhas sao indexaveis como listas, entao as rotinas desta biblioteca aceitam esse formato
+    if not cabe_em_float32(A):
+        raise ValueError("entradas fora da faixa do float32")
+    return [array.array("f", linha) for linha in A]
+
+def fatorar_float32(A, eps=1e-10):
+    # fatoracao lu de a feita e armazenada em float32 (cada entrada gravada eh arredondada para float32)
+    LU, pivos = decomposicao_lu(matriz_float32(A), eps)
+    # o crescimento durante a eliminacao tambem pode estourar a faixa do float32
+    if not cabe_em_float32(LU):
+        raise ValueError("fatoracao lu estourou a faixa do float32")
+    return LU, pivos
+
+def refinar_solucao(A, LU, pivos, b, max_iters=10, tol=None):
+    # resolve a x = b com a fatoracao lu de baixa precisao e corrige x com residuos em float64
+    # para quando a correcao chega ao nivel de arredondamento (tol, padrao n * eps) ou para de diminuir;
+    # devolve (x, convergiu), com convergiu falso se as correcoes estagnarem acima de poucas vezes esse nivel
+    n = len(b)
+    if tol is None:
+        tol = n * sys.float_info.epsilon
+    limite_estagnacao = 10 * tol
+    x = resolver_com_lu(LU, pivos, b)
+    norma_anterior = None
+    norma_d = float("inf")
+    for _ in range(max_iters):
+        # passo 1: residuo r = b - a x calculado em precisao dupla com a matriz original
+        r = [bi - axi for bi, axi in zip(b, multiplicar_matriz_vetor(A, x))]
+        # passo 2: correcao resolvida com a fatoracao barata
+        d = resolver_com_lu(LU, pivos, r)
+        norma_d = norma_vetor(d)
+        norma_x = norma_vetor(x)
+        if norma_anterior is not None and norma_d > norma_anterior:
+            # as correcoes cresceram: descarta esta e decide pelo tamanho da anterior
+            return x, norma_anterior <= limite_estagnacao * norma_x
+        x = [xi + di for xi, di in zip(x, d)]
+        if norma_d <= tol * norma_x:
+            return x, True
+        if norma_anterior is not None and norma_d > 0.5 * norma_anterior:
+            # as correcoes pararam de diminuir: so eh sucesso se ja estivermos no nivel de arredondamento
+            return x, norma_d <= limite_estagnacao * norma_x
+        norma_anterior = norma_d
+    return x, norma_d <= limite_estagnacao * norma_vetor(x)
+
+def resolver_sistema_refinado(A, b, eps=1e-10):
+    # resolve a x = b em precisao mista: lu em float32 + refinamento iterativo ate precisao dupla
+    # se a matriz nao couber em float32 ou o refinamento nao convergir, refaz a fatoracao em float64
+    # (sem limiar absoluto de pivo: so um pivo exatamente nulo faz a fatoracao em float64 falhar)
+    n, n2 = dimensoes_matriz(A)
+    assert n == n2, "matriz deve ser quadrada em resolver_sistema_refinado"
+    assert len(b) == n, "dimensao do vetor nao compativel com a matriz"
+    try:
+        LU, pivos = fatorar_float32(A, eps)
+        x, convergiu = refinar_solucao(A, LU, pivos, b)
+    except ValueError:
+        # fora da faixa do float32, ou algum pivo so ficou abaixo de eps pelo arredondamento
+        convergiu = False
+    if not convergiu:
+        LU, pivos = decomposicao_lu(A, eps=0.0)
+        x, _ = refinar_solucao(A, LU, pivos, b)
+    return x
+
+def inversa_matriz_refinada(A, eps=1e-10):
+    # calcula a inversa coluna por coluna reaproveitando uma unica lu em float32 com refinamento
+    # se alguma coluna nao convergir, troca de vez para uma unica lu em float64 (sem limiar absoluto de pivo)
+    n, n2 = dimensoes_matriz(A)
+    assert n == n2, "matriz deve ser quadrada em inversa_matriz_refinada"
+    try:
+        LU, pivos = fatorar_float32(A, eps)
+        em_float64 = False
+    except ValueError:
+        # fora da faixa do float32, ou algum pivo so ficou abaixo de eps pelo arredondamento
+        LU, pivos = decomposicao_lu(A, eps=0.0)
+        em_float64 = True
+    colunas = []
+    for j in range(n):
+        e = [0.0] * n
+        e[j] = 1.0
+        x, convergiu = refinar_solucao(A, LU, pivos, e)
+        if not convergiu and not em_float64:
+            # mal condicionada para float32: as colunas restantes usam a fatoracao em float64
+            LU, pivos = decomposicao_lu(A, eps=0.0)
+            em_float64 = True
+            x, _ = refinar_solucao(A, LU, pivos, e)
+        colunas.append(x)
+    return [[colunas[j][i] for j in range(n)] for i in range(n)]
+
+# ============================ potencia e exponencial de matriz ============================
+
+def norma_frobenius(A):
+    # raiz da soma dos quadrados (em modulo) de todas as entradas
+    return math.sqrt(sum(abs(x) ** 2 for linha in A for x in linha))
+
+def norma_infinito(A):
+    # maior soma dos modulos de uma linha
+    return max((sum(abs(x) for x in linha) for linha in A), default=0.0)
+
+def decomposicao_espectral(A, limite_condicao=1e8):
+    # tenta escrever a = p diag(autovalores) p^-1; devolve (autovalores, p, p_inv) com os autovetores nas
+    # colunas de p. p_inv eh calculada uma unica vez e vale None quando p eh singular ou mal condicionada
+    # (||p||_f ||p^-1||_f > limite_condicao, por exemplo se a nao for diagonalizavel)
+    n, n2 = dimensoes_matriz(A)
+    assert n == n2, "matriz deve ser quadrada em decomposicao_espectral"
+    simetrica = all(not isinstance(A[i][j], complex) and A[i][j] == A[j][i] for i in range(n) for j in range(i))
+    if simetrica:
+        # caso simetrico: jacobi da p ortogonal, entao p^-1 = p^t
+        autovalores, autovetores = autopares_simetrica_jacobi(A)
+        P = [[autovetores[j][i] for j in range(n)] for i in range(n)]
+        return autovalores, P, matriz_transposta(P)
+    # passo 1: arnoldi completo da a v = v h com v ortogonal e h de hessenberg (mesmos autovalores de a)
+    V = []
+    H = [[0.0] * n for _ in range(n)]
+    estender_fatoracao_krylov(operador_de_matriz(A), V, H, [1.0] * n, n)
+    autovalores = [simplificar_complexo(lam) for lam in autovalores_hessenberg_qr(H)]
+    # passo 2: autovetores y de h por iteracao inversa (lu em banda, o(n^2) cada); para autovalores
+    # repetidos o vetor inicial eh ortogonal aos ja encontrados, para gerar o autoespaco inteiro
+    ys = []
+    for indice, lam in enumerate(autovalores):
+        anteriores = [ys[i] for i in range(indice) if abs(autovalores[i] - lam) <= 1e-8 * max(abs(lam), 1.0)]
+        y0 = None
+        if anteriores:
+            gerador = random.Random(indice)
+            y0, _ = ortogonalizar_contra_base([gerador.uniform(-1.0, 1.0) for _ in range(n)], anteriores)
+        y = autovetor_por_iteracao_inversa(H, lam, y0=y0)
+        if anteriores:
+            y, _ = ortogonalizar_contra_base(y, anteriores)
+            norma = norma_vetor(y)
+            y = [x / norma for x in y] if norma > 0 else y
+        ys.append(y)
+    # passo 3: autovetores de a sao x = v y
+    P = [[simplificar_complexo(sum(V[t][i] * ys[j][t] for t in range(n))) for j in range(n)] for i in range(n)]
+    try:
+        P_inv = inversa_matriz_quadrada(P)
+    except ValueError:
+        return autovalores, P, None
+    if norma_frobenius(P) * norma_frobenius(P_inv) > limite_condicao:
+        P_inv = None
+    return autovalores, P, P_inv
+
+def potencia_matriz(A, k, decomposicao=None):
+    # calcula a^k (k inteiro, negativo usa a inversa) por exponenciacao binaria: o(n^3 log k) em vez de o(k n^3)
+    # se decomposicao = (autovalores, p, p_inv) de decomposicao_espectral for dada com p_inv valida,
+    # usa p d^k p^-1, cujo custo nao depende de k
+    n, n2 = dimensoes_matriz(A)
+    assert n == n2, "matriz deve ser quadrada em potencia_matriz"
+    assert isinstance(k, int), "expoente deve ser inteiro em potencia_matriz"
+    if decomposicao is not None:
+        autovalores, P, P_inv = decomposicao
+        if P_inv is not None and (k >= 0 or all(lam != 0 for lam in autovalores)):
+            # escala as colunas de p por lambda^k e multiplica pela p^-1 guardada
+            PDk = [[P[i][j] * autovalores[j] ** k for j in range(n)] for i in range(n)]
+            return [[simplificar_complexo(x) for x in linha] for linha in multiplicar_matrizes(PDk, P_inv)]
+    if k < 0:
+        A = inversa_matriz_quadrada(A)
+        k = -k
+    tipo, _ = detectar_estrutura(A)
+    if tipo in ("identidade", "diagonal"):
+        return [[A[i][i] ** k if i == j else 0.0 for j in range(n)] for i in range(n)]
+    # exponenciacao binaria: multiplica o resultado pelas potencias a^(2^t) dos bits ligados de k
+    resultado = matriz_identidade(n)
+    base = A
+    while k > 0:
+        if k & 1:
+            resultado = multiplicar_matrizes(resultado, base)
+        k >>= 1
+        if k:
+            base = multiplicar_matrizes(base, base)
+    return resultado
+
+def exponencial_matriz(A, q=6):
+    # calcula e^a por escala e quadrados com aproximante de pade [q/q]:
+    # e^a = (e^(a / 2^s))^(2^s), com s escolhido para que ||a / 2^s|| <= 1/2
+    n, n2 = dimensoes_matriz(A)
+    assert n == n2, "matriz deve ser quadrada em exponencial_matriz"
+    if detectar_estrutura(A)[0] in ("identidade", "diagonal"):
+        exponenciais = [cmath.exp(x) if isinstance(x, complex) else math.exp(x) for x in (A[i][i] for i in range(n))]
+        return [[exponenciais[i] if i == j else 0.0 for j in range(n)] for i in range(n)]
+    # passo 1: escala
+    norma = norma_infinito(A)
+    s = max(0, int(math.floor(math.log2(norma))) + 2) if norma > 0 else 0
+    X = [[x / 2 ** s for x in linha] for linha in A]
+    # passo 2: numerador n e denominador d do aproximante de pade
+    c = 0.5
+    termo = X
+    N = [[(1.0 if i == j else 0.0) + c * X[i][j] for j in range(n)] for i in range(n)]
+    D = [[(1.0 if i == j else 0.0) - c * X[i][j] for j in range(n)] for i in range(n)]
+    for t in range(2, q + 1):
+        c = c * (q - t + 1) / (t * (2 * q - t + 1))
+        termo = multiplicar_matrizes(X, termo)
+        sinal = 1 if t % 2 == 0 else -1
+        for i in range(n):
+            for j in range(n):
+                N[i][j] += c * termo[i][j]
+                D[i][j] += sinal * c * termo[i][j]
+    # passo 3: f = d^-1 n, resolvendo coluna por coluna com uma unica lu
+    LU, pivos = decomposicao_lu(D, eps=0.0)
+    colunas = [resolver_com_lu(LU, pivos, [N[i][j] for i in range(n)]) for j in range(n)]
+    F = [[colunas[j][i] for j in range(n)] for i in range(n)]
+    # passo 4: desfazer a escala elevando ao quadrado s vezes
+    for _ in range(s):
+        F = multiplicar_matrizes(F, F)
+    return F
+
 # ============================ menu principal ============================
 
 def menu_principal():